@@ -13,7 +13,7 @@ from core.board import Board, Street
 from core.card import Card
 from utils.logger import get_logger
 
-logger = get_logger(__name__)
+logger = get_logger(__name__, rate_limit=1.0)
 
 class DQNAgent(RLAgent):
     """Deep Q-Network агент"""
@@ -61,7 +61,7 @@ class DQNAgent(RLAgent):
 
         elapsed_time = time.time() - start_time
         if elapsed_time > current_think_time:
-            logger.warning(f"DQN Think time exceeded: {elapsed_time:.2f}s > {current_think_time}s")
+            logger.warning("DQN Think time exceeded: %.2fs > %ss", elapsed_time, current_think_time)
 
         return action
 
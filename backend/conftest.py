@@ -0,0 +1 @@
+# Корень backend: модули импортируются как game_logic, utils.*, agents.*
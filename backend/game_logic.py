@@ -31,6 +31,12 @@ class Suit(Enum):
 
 Card = namedtuple("Card", ["rank", "suit"])
 
+def card_to_int(card: Card) -> int:
+    return (card.rank.value - 2) * 4 + card.suit.value - 1
+
+def card_from_int(value: int) -> Card:
+    return Card(Rank(value // 4 + 2), Suit(value % 4 + 1))
+
 class Street(Enum):
     FRONT = 1
     MIDDLE = 2
@@ -71,6 +77,7 @@ class Game:
         self.current_player_index = 0
         self.ai_agent = ai_agent
         self.current_street = Street.FRONT
+        self.seq = 0  # номер снимка, растет при каждом сохранении сессии
 
     def create_deck(self):
         self.deck = [Card(rank, suit) for rank in Rank for suit in Suit]
@@ -282,9 +289,7 @@ class Game:
 
         winner = max(self.players, key=lambda p: p.score)
 
-        logger.info("Game ended!")
-        logger.info(f"Scores: {[p.name: p.score for p in self.players]}")
-        logger.info(f"Winner: {winner.name}")
+        logger.info("Game ended", extra={"scores": {p.name: p.score for p in self.players}, "winner": winner.name})
 
         self.deck = []
         self.current_player_index = 0
@@ -315,3 +320,44 @@ class Game:
             "winner": max(self.players, key=lambda p: p.score).name if not self.deck else None
         }
         return game_state
+
+    def to_snapshot(self) -> Dict[str, Any]:
+        """Компактный снимок состояния игры (карты кодируются числами 0-51)."""
+        return {
+            "v": 1,
+            "seq": self.seq,
+            "agent": getattr(self.ai_agent, "name", None),
+            "deck": [card_to_int(card) for card in self.deck],
+            "cur": self.current_player_index,
+            "street": self.current_street.value if self.current_street else None,
+            "players": [
+                [
+                    player.name,
+                    player.score,
+                    [card_to_int(card) for card in player.hand],
+                    [card_to_int(card) for card in player.board.front],
+                    [card_to_int(card) for card in player.board.middle],
+                    [card_to_int(card) for card in player.board.back],
+                ]
+                for player in self.players
+            ],
+        }
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Dict[str, Any], ai_agent) -> "Game":
+        players = []
+        for name, score, hand, front, middle, back in snapshot["players"]:
+            player = Player(name)
+            player.score = score
+            player.hand = [card_from_int(value) for value in hand]
+            player.board.front = [card_from_int(value) for value in front]
+            player.board.middle = [card_from_int(value) for value in middle]
+            player.board.back = [card_from_int(value) for value in back]
+            players.append(player)
+
+        game = cls(players, ai_agent)
+        game.deck = [card_from_int(value) for value in snapshot["deck"]]
+        game.seq = snapshot["seq"]
+        game.current_player_index = snapshot["cur"]
+        game.current_street = Street(snapshot["street"]) if snapshot["street"] is not None else None
+        return game
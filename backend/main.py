@@ -1,7 +1,9 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import HTMLResponse
 from typing import List, Dict
 import json
+import os
+import uuid
 import uvicorn
 from pathlib import Path
 
@@ -10,40 +12,83 @@ from agents.rl.dqn import DQNAgent  # Или любой другой агент
 from agents.rl.a3c import A3CAgent
 from agents.rl.ppo import PPOAgent
 from utils.logger import get_logger
+from utils.session_store import SessionStore
+from utils.static_cache import StaticAssetCache
 
 logger = get_logger(__name__)
 
 app = FastAPI()
 
 # Глобальные переменные
-game: Game = None
 ai_agents: Dict[str, object] = {}
 
+# Снимки сессий общие для всех воркеров на машине
+session_store = SessionStore(Path(os.environ.get("SESSION_DB_PATH", Path(__file__).parent / "sessions.db")))
+
 # Путь к frontend сборке
 frontend_build_path = Path(__file__).parent.parent / "frontend" / "build"
+static_cache = StaticAssetCache(frontend_build_path)
+
+@app.on_event("startup")
+async def load_static_assets():
+    """Загрузка frontend сборки в память и предварительное сжатие."""
+    static_cache.load()
+
+@app.on_event("startup")
+async def start_session_store():
+    session_store.start()
+
+@app.on_event("shutdown")
+async def stop_session_store():
+    session_store.close()
+
+def get_ai_agent(ai_agent_name: str):
+    if ai_agent_name in ai_agents:
+        return ai_agents[ai_agent_name]
+
+    if ai_agent_name == "DQN":
+        ai_agent = DQNAgent.load_latest(name=ai_agent_name, state_size=225, action_size=15, config={})
+    elif ai_agent_name == "A3C":
+        ai_agent = A3CAgent.load_latest(name=ai_agent_name, state_size=225, action_size=15, config={})
+    elif ai_agent_name == "PPO":
+        ai_agent = PPOAgent.load_latest(name=ai_agent_name, state_size=225, action_size=15, config={})
+    else:
+        ai_agent = DQNAgent.load_latest(name="DQN", state_size=225, action_size=15, config={})  # Default agent
+    ai_agents[ai_agent_name] = ai_agent
+    return ai_agent
+
+def persist_game(session_id: str, game: Game):
+    """Сохраняет снимок сессии; завершенную игру (пустая колода) снимает с хранения."""
+    game.seq += 1
+    if not game.deck:
+        session_store.finish(session_id, game.seq)
+    else:
+        session_store.save(session_id, game.to_snapshot())
 
 @app.get("/")
-async def get():
-    index_path = frontend_build_path / "index.html"
-    if index_path.exists():
-        return FileResponse(index_path)
+async def get(request: Request):
+    response = static_cache.response("index.html", request.headers)
+    if response is not None:
+        return response
     else:
         logger.error("Frontend build not found. Run 'npm run build' in the frontend directory.")
         return HTMLResponse(content="<h1>Error: Frontend build not found.</h1>", status_code=500)
 
 @app.get("/static/{rest_of_path:path}")
-async def serve_static(rest_of_path: str):
+async def serve_static(rest_of_path: str, request: Request):
     """Обслуживание статических файлов из frontend сборки."""
-    file_path = frontend_build_path / "static" / rest_of_path
-    if file_path.exists():
-        return FileResponse(file_path)
+    response = static_cache.response(f"static/{rest_of_path}", request.headers)
+    if response is not None:
+        return response
     else:
         return HTMLResponse(status_code=404)
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
-    global game, ai_agents
+    global ai_agents
     await websocket.accept()
+    game: Game = None
+    session_id: str = None
     try:
         while True:
             data = await websocket.receive_text()
@@ -52,25 +97,26 @@ async def websocket_endpoint(websocket: WebSocket):
 
             if action == "start_game":
                 player_names = message.get("player_names", ["Player 1", "AI"])
-                ai_agent_name = message.get("ai_agent", "DQN")
-
-                if ai_agent_name in ai_agents:
-                    ai_agent = ai_agents[ai_agent_name]
-                else:
-                    if ai_agent_name == "DQN":
-                        ai_agent = DQNAgent.load_latest(name=ai_agent_name, state_size=225, action_size=15, config={})
-                    elif ai_agent_name == "A3C":
-                        ai_agent = A3CAgent.load_latest(name=ai_agent_name, state_size=225, action_size=15, config={})
-                    elif ai_agent_name == "PPO":
-                        ai_agent = PPOAgent.load_latest(name=ai_agent_name, state_size=225, action_size=15, config={})
-                    else:
-                        ai_agent = DQNAgent.load_latest(name="DQN", state_size=225, action_size=15, config={})  # Default agent
-                    ai_agents[ai_agent_name] = ai_agent
+                ai_agent = get_ai_agent(message.get("ai_agent", "DQN"))
 
                 players = [Player(name) for name in player_names]
                 game = Game(players, ai_agent)
                 game.start_game()
-                await send_game_state(websocket)
+                session_id = uuid.uuid4().hex
+                persist_game(session_id, game)
+                await send_game_state(websocket, game, session_id)
+
+            elif action == "resume_game":
+                requested_id = message.get("session_id")
+                snapshot = None
+                if isinstance(requested_id, str) and requested_id:
+                    snapshot = session_store.load(requested_id)
+                if snapshot is None:
+                    await websocket.send_json({"error": "Session not found", "session_expired": True})
+                    continue
+                session_id = requested_id
+                game = Game.from_snapshot(snapshot, get_ai_agent(snapshot["agent"] or "DQN"))
+                await send_game_state(websocket, game, session_id)
 
             elif action == "make_move":
                 player_index = message.get("player_index")
@@ -81,8 +127,12 @@ async def websocket_endpoint(websocket: WebSocket):
                     try:
                         card = game.players[player_index].hand[card_index]
                         street = Street[street_name]
-                        game.make_move(player_index, card, street)
-                        await send_game_state(websocket)
+                        try:
+                            game.make_move(player_index, card, street)
+                        finally:
+                            # make_move может изменить доску до исключения
+                            persist_game(session_id, game)
+                        await send_game_state(websocket, game, session_id)
 
                         if game and game.players[game.current_player_index].name == "AI" and not game.get_game_state()["game_over"]:
                             ai_legal_moves = game.get_legal_moves(game.current_player_index)
@@ -94,11 +144,14 @@ async def websocket_endpoint(websocket: WebSocket):
                                     None,
                                     think_time=1
                                 )
-                                game.make_move(game.current_player_index, ai_card, ai_street)
-                                await send_game_state(websocket)
+                                try:
+                                    game.make_move(game.current_player_index, ai_card, ai_street)
+                                finally:
+                                    persist_game(session_id, game)
+                                await send_game_state(websocket, game, session_id)
 
                     except (IndexError, ValueError, KeyError, AttributeError) as e:
-                        logger.error(f"Invalid move: {e}")
+                        logger.error("Invalid move: %s", e)
                         await websocket.send_json({"error": str(e)})
 
             elif action == "load_ai_model":
@@ -119,15 +172,16 @@ async def websocket_endpoint(websocket: WebSocket):
                     ai_agents[agent_name] = agent
                     await websocket.send_json({"message": f"AI model '{agent_name}' loaded successfully."})
                 except Exception as e:
-                    logger.error(f"Failed to load AI model: {e}")
+                    logger.error("Failed to load AI model: %s", e)
                     await websocket.send_json({"error": str(e)})
 
     except WebSocketDisconnect:
         pass
 
-async def send_game_state(websocket: WebSocket):
+async def send_game_state(websocket: WebSocket, game: Game, session_id: str):
     if game:
         game_state = game.get_game_state()
+        game_state["session_id"] = session_id
         await websocket.send_json(game_state)
 
 if __name__ == "__main__":
@@ -0,0 +1,82 @@
+import json
+import logging
+
+import pytest
+
+from utils import logger as logger_module
+from utils.logger import HotPathFilter, get_logger, shutdown_logging
+
+
+@pytest.fixture
+def read_lines(capsys):
+    def read():
+        # Дожидаемся, пока слушатель выпишет очередь
+        shutdown_logging()
+        return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    return read
+
+
+def _record(msg: str, level: int = logging.WARNING) -> logging.LogRecord:
+    return logging.LogRecord("test", level, __file__, 0, msg, None, None)
+
+
+def test_repeated_get_logger_adds_no_handler():
+    first = get_logger("tests.repeated")
+    second = get_logger("tests.repeated")
+    assert first is second
+    assert len(first.handlers) == 1
+
+
+def test_json_output_with_extras_and_exc(read_lines):
+    log = get_logger("tests.json")
+    data = {"k": 1}
+    log.info("value %s", data, extra={"table": 7})
+    data["k"] = 2
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        log.exception("failed")
+
+    info, error = read_lines()
+    assert info["msg"] == "value {'k': 1}"
+    assert info["level"] == "INFO"
+    assert info["logger"] == "tests.json"
+    assert info["table"] == 7
+    assert "exc" not in info
+    assert error["msg"] == "failed"
+    assert "ZeroDivisionError" in error["exc"]
+
+
+def test_logger_writes_after_shutdown(read_lines):
+    log = get_logger("tests.shutdown")
+    shutdown_logging()
+    log.info("after shutdown")
+    assert [line["msg"] for line in read_lines()] == ["after shutdown"]
+
+
+def test_hot_path_filter_burst_and_suppressed_count(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(logger_module.time, "monotonic", lambda: now[0])
+    hot_filter = HotPathFilter(rate_limit=1.0, burst=2)
+
+    assert hot_filter.filter(_record("hot"))
+    assert hot_filter.filter(_record("hot"))
+    assert not hot_filter.filter(_record("hot"))
+    assert not hot_filter.filter(_record("hot"))
+    # Другой шаблон сообщения имеет свой лимит
+    assert hot_filter.filter(_record("other"))
+
+    now[0] += 1.0
+    record = _record("hot")
+    assert hot_filter.filter(record)
+    assert record.suppressed == 2
+    assert not hot_filter.filter(_record("hot"))
+
+
+def test_hot_path_filter_sampling(monkeypatch):
+    hot_filter = HotPathFilter(sample_rate=0.5)
+    monkeypatch.setattr(logger_module.random, "random", lambda: 0.7)
+    assert not hot_filter.filter(_record("sampled", logging.INFO))
+    assert hot_filter.filter(_record("sampled", logging.WARNING))
+    monkeypatch.setattr(logger_module.random, "random", lambda: 0.2)
+    assert hot_filter.filter(_record("sampled", logging.INFO))
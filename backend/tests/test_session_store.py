@@ -0,0 +1,173 @@
+import sqlite3
+import time
+
+import pytest
+
+from game_logic import Game, Player
+from utils.session_store import SessionStore
+
+
+class StubAgent:
+    name = "DQN"
+
+
+class FlakyConnection:
+    """Обертка над соединением, у которой первая запись снимков падает."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+        self.failures = 1
+
+    def executemany(self, *args):
+        if self.failures:
+            self.failures -= 1
+            raise sqlite3.OperationalError("database is locked")
+        return self._conn.executemany(*args)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._conn.__exit__(*exc)
+
+
+class FlakyStore(SessionStore):
+    def _connect(self):
+        return FlakyConnection(super()._connect())
+
+
+def _wait_for(predicate, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def _row_count(db_path) -> int:
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def game():
+    game = Game([Player("Player 1"), Player("AI")], StubAgent())
+    game.start_game()
+    return game
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "sessions.db"
+
+
+def test_snapshot_round_trip(game):
+    restored = Game.from_snapshot(game.to_snapshot(), StubAgent())
+    assert restored.get_game_state() == game.get_game_state()
+    assert restored.to_snapshot() == game.to_snapshot()
+
+
+def test_save_close_and_load_from_second_store(game, db_path):
+    store = SessionStore(db_path)
+    store.start()
+    game.seq = 1
+    store.save("abc", game.to_snapshot())
+    store.close()
+
+    other = SessionStore(db_path)
+    other.start()
+    try:
+        snapshot = other.load("abc")
+        assert snapshot is not None
+        assert Game.from_snapshot(snapshot, StubAgent()).get_game_state() == game.get_game_state()
+        assert other.load("missing") is None
+    finally:
+        other.close()
+
+
+def test_expired_session_is_not_loaded(game, db_path):
+    store = SessionStore(db_path)
+    store.start()
+    game.seq = 1
+    store.save("abc", game.to_snapshot())
+    store.close()
+
+    time.sleep(0.05)
+    expired = SessionStore(db_path, ttl=0.01)
+    expired.start()
+    try:
+        assert expired.load("abc") is None
+    finally:
+        expired.close()
+
+
+def test_stale_snapshot_does_not_overwrite_newer(game, db_path):
+    newer = SessionStore(db_path)
+    newer.start()
+    game.seq = 2
+    newer.save("abc", game.to_snapshot())
+    newer.close()
+
+    stale = SessionStore(db_path)
+    stale.start()
+    stale_game = Game.from_snapshot(game.to_snapshot(), StubAgent())
+    stale_game.seq = 1
+    stale_game.current_player_index = 1
+    stale.save("abc", stale_game.to_snapshot())
+    stale.close()
+
+    store = SessionStore(db_path)
+    store.start()
+    try:
+        assert store.load("abc")["seq"] == 2
+    finally:
+        store.close()
+
+
+def test_finished_session_is_not_loaded(game, db_path):
+    store = SessionStore(db_path)
+    store.start()
+    game.seq = 1
+    store.save("abc", game.to_snapshot())
+    store.finish("abc", 2)
+    assert store.load("abc") is None
+    store.close()
+
+    other = SessionStore(db_path)
+    other.start()
+    try:
+        assert other.load("abc") is None
+    finally:
+        other.close()
+
+
+def test_failed_write_is_retried_without_new_saves(game, db_path):
+    store = FlakyStore(db_path)
+    store.start()
+    try:
+        game.seq = 1
+        store.save("abc", game.to_snapshot())
+        assert _wait_for(lambda: _row_count(db_path) == 1)
+    finally:
+        store.close()
+
+
+def test_expired_rows_are_pruned_while_running(game, db_path):
+    store = SessionStore(db_path, ttl=0.5, prune_interval=0.05)
+    store.start()
+    try:
+        game.seq = 1
+        store.save("abc", game.to_snapshot())
+        store.finish("done", 1)
+        assert _wait_for(lambda: _row_count(db_path) == 2)
+        assert _wait_for(lambda: _row_count(db_path) == 0)
+    finally:
+        store.close()
@@ -0,0 +1,82 @@
+import types
+
+import pytest
+from fastapi.responses import FileResponse
+
+from utils import static_cache as static_cache_module
+from utils.static_cache import IMMUTABLE_CACHE, REVALIDATE_CACHE, StaticAssetCache
+
+HASHED_JS = "static/js/main.3f2a1b4c.js"
+PLAIN_JS = "static/js/plain.js"
+JS_BODY = "var a = 1;\n" * 200
+
+
+@pytest.fixture
+def build_dir(tmp_path):
+    (tmp_path / "static" / "js").mkdir(parents=True)
+    (tmp_path / "index.html").write_text("<html>" + "x" * 1000 + "</html>")
+    (tmp_path / HASHED_JS).write_text(JS_BODY)
+    (tmp_path / PLAIN_JS).write_text(JS_BODY)
+    (tmp_path.parent / "secret.txt").write_text("secret")
+    return tmp_path
+
+
+@pytest.fixture
+def cache(build_dir, monkeypatch):
+    fake_brotli = types.SimpleNamespace(compress=lambda body, quality: b"brotli")
+    monkeypatch.setattr(static_cache_module, "brotli", fake_brotli)
+    cache = StaticAssetCache(build_dir)
+    cache.load()
+    return cache
+
+
+def test_encoding_negotiation(cache):
+    br = cache.response(HASHED_JS, {"accept-encoding": "gzip, br"})
+    assert br.headers["content-encoding"] == "br"
+    assert br.body == b"brotli"
+
+    gz = cache.response(HASHED_JS, {"accept-encoding": "gzip, br;q=0"})
+    assert gz.headers["content-encoding"] == "gzip"
+    assert len(gz.body) < len(JS_BODY)
+
+    identity = cache.response(HASHED_JS, {"accept-encoding": "gzip;q=0"})
+    assert "content-encoding" not in identity.headers
+    assert identity.body == JS_BODY.encode()
+
+    etags = {br.headers["etag"], gz.headers["etag"], identity.headers["etag"]}
+    assert len(etags) == 3
+    assert all(r.headers["vary"] == "Accept-Encoding" for r in (br, gz, identity))
+
+
+def test_not_modified(cache):
+    etag = cache.response(HASHED_JS, {}).headers["etag"]
+    gz_etag = cache.response(HASHED_JS, {"accept-encoding": "gzip"}).headers["etag"]
+
+    assert cache.response(HASHED_JS, {"if-none-match": etag}).status_code == 304
+    assert cache.response(HASHED_JS, {"if-none-match": "W/" + etag}).status_code == 304
+    assert cache.response(HASHED_JS, {"if-none-match": '"other", ' + gz_etag}).status_code == 304
+    assert cache.response(HASHED_JS, {"if-none-match": "*"}).status_code == 304
+    assert cache.response(HASHED_JS, {"if-none-match": '"other"'}).status_code == 200
+
+
+def test_cache_control(cache):
+    assert cache.response(HASHED_JS, {}).headers["cache-control"] == IMMUTABLE_CACHE
+    assert cache.response(PLAIN_JS, {}).headers["cache-control"] == REVALIDATE_CACHE
+    assert cache.response("index.html", {}).headers["cache-control"] == REVALIDATE_CACHE
+
+
+def test_disk_fallback_over_max_bytes(build_dir):
+    cache = StaticAssetCache(build_dir, max_bytes=10)
+    cache.load()
+
+    response = cache.response(HASHED_JS, {})
+    assert isinstance(response, FileResponse)
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE
+    etag = response.headers["etag"]
+    assert cache.response(HASHED_JS, {"if-none-match": etag}).status_code == 304
+
+
+def test_unknown_and_traversal_paths(cache):
+    assert cache.response("static/js/missing.js", {}) is None
+    assert cache.response("static/../index.html", {}) is None
+    assert cache.response("../secret.txt", {}) is None
@@ -1,31 +1,217 @@
+import atexit
+import json
 import logging
+import queue
+import random
 import sys
-from typing import Optional
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
-def get_logger(name: str, 
+# Атрибуты стандартного LogRecord, которые не попадают в JSON как extra-поля
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_lock = threading.Lock()
+_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_listener: Optional[QueueListener] = None
+_atexit_registered = False
+_configured: Dict[str, logging.Logger] = {}
+_file_handlers: Dict[str, logging.Handler] = {}
+
+
+class JsonFormatter(logging.Formatter):
+    """Форматирует запись как одну строку JSON."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class HotPathFilter(logging.Filter):
+    """
+    Ограничивает частоту одинаковых сообщений и сэмплирует шумные уровни.
+
+    Ключ ограничения — (уровень, шаблон сообщения), поэтому разные сообщения
+    одного логгера не вытесняют друг друга. Число отброшенных записей
+    добавляется в следующую пропущенную запись как поле ``suppressed``.
+    """
+
+    def __init__(self,
+                 rate_limit: Optional[float] = None,
+                 burst: int = 5,
+                 sample_rate: float = 1.0,
+                 sample_below: int = logging.WARNING):
+        super().__init__()
+        self.rate_limit = rate_limit  # сообщений в секунду на ключ
+        self.burst = burst
+        self.sample_rate = sample_rate
+        self.sample_below = sample_below
+        self._buckets: Dict[Tuple[int, str], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.sample_rate < 1.0 and record.levelno < self.sample_below:
+            if random.random() >= self.sample_rate:
+                return False
+        if self.rate_limit is None:
+            return True
+
+        key = (record.levelno, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            # bucket: [токены, время последнего пополнения, отброшено]
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(self.burst), now, 0]
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate_limit)
+            bucket[1] = now
+            if tokens < 1.0:
+                bucket[0] = tokens
+                bucket[2] += 1
+                return False
+            bucket[0] = tokens - 1.0
+            suppressed, bucket[2] = bucket[2], 0
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+_exc_formatter = logging.Formatter()
+
+
+class _JsonQueueHandler(QueueHandler):
+    """
+    Передает запись слушателю, подставив аргументы в сообщение в момент
+    вызова. Traceback форматируется здесь же, только для записей с
+    exc_info; остальная сборка JSON выполняется в потоке слушателя.
+    После shutdown_logging записи пишутся напрямую, без очереди.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if _listener is None:
+            _router.handle(self.prepare(record))
+        else:
+            super().emit(record)
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """Пишет в текущий sys.stdout, даже если его подменили после настройки."""
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class _RoutingHandler(logging.Handler):
+    """Выполняется в потоке слушателя: пишет в консоль и в файлы логгеров."""
+
+    def __init__(self):
+        super().__init__()
+        self.console = _StdoutHandler()
+        self.console.setFormatter(JsonFormatter())
+        self.routes: Dict[str, List[logging.Handler]] = {}
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.console.handle(record)
+        for handler in self.routes.get(record.name, ()):
+            handler.handle(record)
+
+    def flush(self) -> None:
+        self.console.flush()
+        for handlers in self.routes.values():
+            for handler in handlers:
+                handler.flush()
+
+
+_router = _RoutingHandler()
+
+
+def _ensure_listener() -> None:
+    global _listener, _atexit_registered
+    if _listener is None:
+        _listener = QueueListener(_queue, _router)
+        _listener.start()
+        if not _atexit_registered:
+            atexit.register(shutdown_logging)
+            _atexit_registered = True
+
+
+def shutdown_logging() -> None:
+    """
+    Останавливает фоновый поток, дописав все записи из очереди. Дальнейшие
+    записи уже настроенных логгеров пишутся синхронно в вызывающем потоке.
+    """
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+            _router.flush()
+
+
+def get_logger(name: str,
                level: int = logging.INFO,
-               log_file: Optional[str] = None) -> logging.Logger:
+               log_file: Optional[str] = None,
+               rate_limit: Optional[float] = None,
+               burst: int = 5,
+               sample_rate: float = 1.0) -> logging.Logger:
     """
     Создает и настраивает логгер.
+
+    Логгер настраивается один раз на имя: повторные вызовы возвращают его
+    без добавления обработчиков. Записи передаются через QueueHandler в
+    фоновый поток, который выводит их строками JSON. ``rate_limit`` и
+    ``sample_rate`` включают HotPathFilter для логгеров горячего пути.
     """
-    logger = logging.getLogger(name)
-    logger.setLevel(level)
-    
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
-    if log_file:
-        log_path = Path(log_file)
-        log_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-        
-    return logger
+    with _lock:
+        logger = _configured.get(name)
+        if logger is not None:
+            return logger
+
+        logger = logging.getLogger(name)
+        logger.setLevel(level)
+        logger.propagate = False
+
+        queue_handler = _JsonQueueHandler(_queue)
+        if rate_limit is not None or sample_rate < 1.0:
+            queue_handler.addFilter(HotPathFilter(rate_limit=rate_limit, burst=burst, sample_rate=sample_rate))
+        logger.addHandler(queue_handler)
+
+        if log_file:
+            file_handler = _file_handlers.get(log_file)
+            if file_handler is None:
+                log_path = Path(log_file)
+                log_path.parent.mkdir(parents=True, exist_ok=True)
+
+                file_handler = logging.FileHandler(log_file)
+                file_handler.setFormatter(JsonFormatter())
+                _file_handlers[log_file] = file_handler
+            _router.routes.setdefault(name, []).append(file_handler)
+
+        _ensure_listener()
+        _configured[name] = logger
+        return logger
@@ -0,0 +1,181 @@
+import atexit
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    data TEXT,
+    seq INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+)
+"""
+
+MAX_RETRY_BACKOFF = 5.0
+
+
+class SessionStore:
+    """
+    Хранилище снимков игровых сессий в SQLite (режим WAL).
+
+    ``save`` только кладет сериализованный снимок в буфер: фоновый поток
+    раз в ``flush_interval`` секунд записывает накопленные снимки одной
+    транзакцией, оставляя для каждой сессии только последний. Файл базы
+    общий для всех воркеров на машине, поэтому сессию может восстановить
+    любой из них.
+
+    Каждый снимок несет номер ``seq``; строка в базе обновляется только
+    более новым номером, поэтому отложенная запись другого воркера не
+    затрет свежие ходы. Завершенная сессия хранится как запись без данных
+    и при загрузке не возвращается. Записи старше ``ttl`` удаляются
+    фоновым потоком раз в ``prune_interval`` секунд.
+    """
+
+    def __init__(self, db_path: Path, flush_interval: float = 0.05, ttl: float = 24 * 3600,
+                 prune_interval: float = 300.0):
+        self.db_path = Path(db_path)
+        self.flush_interval = flush_interval
+        self.ttl = ttl
+        self.prune_interval = prune_interval
+        # session_id -> (данные или None для завершенной сессии, seq, время)
+        self._pending: Dict[str, Tuple[Optional[str], int, float]] = {}
+        self._inflight: Dict[str, Tuple[Optional[str], int, float]] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._reader: Optional[sqlite3.Connection] = None
+        self._reader_lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), timeout=5.0, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(_SCHEMA)
+        return conn
+
+    def start(self) -> None:
+        if self._writer is not None:
+            return
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._reader = self._connect()
+        self._stopped.clear()
+        self._writer = threading.Thread(target=self._run, name="session-store-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def close(self) -> None:
+        """Останавливает фоновый поток, записав все буферизованные снимки."""
+        if self._writer is None:
+            return
+        self._stopped.set()
+        self._wakeup.set()
+        self._writer.join()
+        self._writer = None
+        with self._reader_lock:
+            self._reader.close()
+            self._reader = None
+
+    def save(self, session_id: str, snapshot: Dict[str, Any]) -> None:
+        """Буферизует снимок; ``snapshot["seq"]`` должен расти с каждым ходом."""
+        data = json.dumps(snapshot, separators=(",", ":"))
+        self._put(session_id, (data, snapshot["seq"], time.time()))
+
+    def finish(self, session_id: str, seq: int) -> None:
+        """Помечает сессию завершенной: ``load`` больше ее не вернет."""
+        self._put(session_id, (None, seq, time.time()))
+
+    def _put(self, session_id: str, item: Tuple[Optional[str], int, float]) -> None:
+        with self._lock:
+            self._pending[session_id] = item
+        self._wakeup.set()
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            local = self._pending.get(session_id) or self._inflight.get(session_id)
+
+        with self._reader_lock:
+            if self._reader is None:
+                return None
+            row = self._reader.execute(
+                "SELECT data, seq, updated_at FROM sessions WHERE id = ?",
+                (session_id,),
+            ).fetchone()
+
+        # Берем более новый из локального буфера и базы (ее мог обновить другой воркер)
+        candidates = [item for item in (local, row) if item is not None]
+        if not candidates:
+            return None
+        data, _, updated_at = max(candidates, key=lambda item: item[1])
+        if data is None or updated_at < time.time() - self.ttl:
+            return None
+        return json.loads(data)
+
+    def _run(self) -> None:
+        conn = self._connect()
+        backoff = self.flush_interval
+        try:
+            self._prune(conn)
+            next_prune = time.monotonic() + self.prune_interval
+            while not self._stopped.is_set():
+                # Просыпаемся и без новых снимков, чтобы вовремя чистить базу
+                if self._wakeup.wait(self.prune_interval):
+                    # Небольшая пауза, чтобы собрать в одну транзакцию ходы нескольких столов
+                    self._stopped.wait(self.flush_interval)
+                    self._wakeup.clear()
+                    if self._flush(conn):
+                        backoff = self.flush_interval
+                    else:
+                        # Повторяем запись сами: новых save может и не быть
+                        self._stopped.wait(backoff)
+                        backoff = min(backoff * 2, MAX_RETRY_BACKOFF)
+                        self._wakeup.set()
+                if time.monotonic() >= next_prune:
+                    self._prune(conn)
+                    next_prune = time.monotonic() + self.prune_interval
+            self._flush(conn)
+        finally:
+            conn.close()
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        try:
+            with conn:
+                conn.execute("DELETE FROM sessions WHERE updated_at < ?", (time.time() - self.ttl,))
+        except sqlite3.Error as e:
+            logger.error("Failed to prune expired sessions: %s", e)
+
+    def _flush(self, conn: sqlite3.Connection) -> bool:
+        """Записывает буфер одной транзакцией; False, если запись не удалась."""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+            self._inflight = batch
+        if not batch:
+            return True
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO sessions (id, data, seq, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET "
+                    "data = excluded.data, seq = excluded.seq, updated_at = excluded.updated_at "
+                    "WHERE excluded.seq > sessions.seq",
+                    [(session_id, data, seq, updated_at) for session_id, (data, seq, updated_at) in batch.items()],
+                )
+        except sqlite3.Error as e:
+            logger.error("Failed to write %d session snapshots: %s", len(batch), e)
+            # Возвращаем снимки в буфер, если их не перезаписали более новыми
+            with self._lock:
+                for session_id, item in batch.items():
+                    self._pending.setdefault(session_id, item)
+            return False
+        finally:
+            with self._lock:
+                self._inflight = {}
+        return True
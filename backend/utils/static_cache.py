@@ -0,0 +1,180 @@
+import gzip
+import hashlib
+import mimetypes
+import re
+from pathlib import Path
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+from fastapi.responses import FileResponse, Response
+
+from utils.logger import get_logger
+
+try:
+    import brotli  # опциональная зависимость
+except ImportError:
+    brotli = None
+
+logger = get_logger(__name__)
+
+# CRA кладет хэш содержимого в имя файла: main.3f2a1b4c.js, 787.1a2b3c4d.chunk.css
+HASHED_NAME_RE = re.compile(r"\.[0-9a-f]{8,}\.")
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+COMPRESS_MIN_SIZE = 256
+# Строгий ETag должен отличаться для каждого content-coding (RFC 9110 §8.8.3)
+ETAG_SUFFIXES = {"identity": "", "gzip": "-gz", "br": "-br"}
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def _cache_control_for(file_path: Path) -> str:
+    return IMMUTABLE_CACHE if HASHED_NAME_RE.search(file_path.name) else REVALIDATE_CACHE
+
+
+def _etag_for(digest: "hashlib._Hash", encoding: str = "identity") -> str:
+    return '"%s%s"' % (digest.hexdigest()[:32], ETAG_SUFFIXES[encoding])
+
+
+def _etag_matches(headers: Mapping[str, str], etags: Iterable[str]) -> bool:
+    if_none_match = headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or not tags.isdisjoint(etags)
+
+
+class StaticAsset:
+    """Файл сборки в памяти вместе с предсжатыми вариантами."""
+
+    def __init__(self, path: Path, body: bytes, media_type: str, cache_control: str):
+        self.path = path
+        self.media_type = media_type
+        self.cache_control = cache_control
+        self.variants: Dict[str, bytes] = {"identity": body}
+
+        if len(body) >= COMPRESS_MIN_SIZE and media_type.startswith(COMPRESSIBLE_TYPES):
+            gz = gzip.compress(body, compresslevel=9, mtime=0)
+            if len(gz) < len(body):
+                self.variants["gzip"] = gz
+            if brotli is not None:
+                br = brotli.compress(body, quality=11)
+                if len(br) < len(body):
+                    self.variants["br"] = br
+
+        digest = hashlib.sha256(body)
+        self.etags: Dict[str, str] = {encoding: _etag_for(digest, encoding) for encoding in self.variants}
+
+    @property
+    def size(self) -> int:
+        return sum(len(v) for v in self.variants.values())
+
+
+def _accepted_encodings(header: str) -> set:
+    accepted = set()
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q=") and q[2:].strip() in ("0", "0.0", "0.00", "0.000"):
+            continue
+        if coding:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class StaticAssetCache:
+    """
+    Кэш файлов frontend сборки.
+
+    При загрузке индексирует все файлы каталога и держит в памяти их
+    содержимое (со сжатыми вариантами) в пределах ``max_bytes``. Файлы,
+    не поместившиеся в лимит, отдаются с диска через FileResponse с теми же
+    ETag и Cache-Control, посчитанными при индексации; наличие файла все
+    равно проверяется по индексу, без обращения к диску.
+    """
+
+    def __init__(self, root: Path, max_bytes: int = 64 * 1024 * 1024):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._index: Dict[str, Path] = {}
+        self._assets: Dict[str, StaticAsset] = {}
+        # rel_path -> (ETag, Cache-Control) для файлов, отдаваемых с диска
+        self._disk_headers: Dict[str, Tuple[str, str]] = {}
+
+    def load(self) -> None:
+        self._index.clear()
+        self._assets.clear()
+        self._disk_headers.clear()
+        self.total_bytes = 0
+        if not self.root.is_dir():
+            logger.warning("Static root %s not found, cache is empty", self.root)
+            return
+
+        for file_path in sorted(self.root.rglob("*")):
+            if not file_path.is_file():
+                continue
+            rel_path = file_path.relative_to(self.root).as_posix()
+            self._index[rel_path] = file_path
+            if self._try_cache(rel_path, file_path) is None:
+                self._disk_headers[rel_path] = (self._hash_file(file_path), _cache_control_for(file_path))
+
+        logger.info("Static assets loaded", extra={
+            "files": len(self._index),
+            "cached": len(self._assets),
+            "bytes": self.total_bytes,
+        })
+
+    def _try_cache(self, rel_path: str, file_path: Path) -> Optional[StaticAsset]:
+        media_type = mimetypes.guess_type(file_path.name)[0] or "application/octet-stream"
+        cache_control = _cache_control_for(file_path)
+        if self.total_bytes + file_path.stat().st_size > self.max_bytes:
+            return None
+        body = file_path.read_bytes()
+        asset = StaticAsset(file_path, body, media_type, cache_control)
+        if self.total_bytes + asset.size > self.max_bytes:
+            return None
+        self._assets[rel_path] = asset
+        self.total_bytes += asset.size
+        return asset
+
+    @staticmethod
+    def _hash_file(file_path: Path) -> str:
+        digest = hashlib.sha256()
+        with file_path.open("rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return _etag_for(digest)
+
+    def response(self, rel_path: str, headers: Mapping[str, str]) -> Optional[Response]:
+        """Ответ для файла сборки или None, если такого файла нет."""
+        asset = self._assets.get(rel_path)
+        if asset is None:
+            return self._disk_response(rel_path, headers)
+
+        accepted = _accepted_encodings(headers.get("accept-encoding", ""))
+        encoding = next((e for e in ("br", "gzip") if e in asset.variants and e in accepted), "identity")
+        common_headers = {
+            "ETag": asset.etags[encoding],
+            "Cache-Control": asset.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+
+        # Тело одно и то же, поэтому 304 допустим для тега любого варианта
+        if _etag_matches(headers, asset.etags.values()):
+            return Response(status_code=304, headers=common_headers)
+
+        if encoding != "identity":
+            common_headers["Content-Encoding"] = encoding
+        return Response(asset.variants[encoding], media_type=asset.media_type, headers=common_headers)
+
+    def _disk_response(self, rel_path: str, headers: Mapping[str, str]) -> Optional[Response]:
+        file_path = self._index.get(rel_path)
+        if file_path is None:
+            return None
+
+        etag, cache_control = self._disk_headers[rel_path]
+        common_headers = {"ETag": etag, "Cache-Control": cache_control}
+        if _etag_matches(headers, (etag,)):
+            return Response(status_code=304, headers=common_headers)
+        return FileResponse(file_path, headers=common_headers)
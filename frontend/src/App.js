@@ -14,10 +14,25 @@ function App() {
         newWs.onopen = () => {
             setWs(newWs);
             console.log('WebSocket connection opened');
+
+            // Восстановление стола после переподключения или рестарта сервера
+            const sessionId = localStorage.getItem('sessionId');
+            if (sessionId) {
+                newWs.send(JSON.stringify({ action: 'resume_game', session_id: sessionId }));
+            }
         };
 
         newWs.onmessage = (event) => {
             const newGameState = JSON.parse(event.data);
+            if (newGameState.session_expired) {
+                localStorage.removeItem('sessionId');
+                return;
+            }
+            if (newGameState.game_over) {
+                localStorage.removeItem('sessionId');
+            } else if (newGameState.session_id) {
+                localStorage.setItem('sessionId', newGameState.session_id);
+            }
             setGameState(newGameState);
             console.log('Received game state:', newGameState);
         };